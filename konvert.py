@@ -1,38 +1,26 @@
 #!/usr/bin/python3
 
-from typing import List, Dict, Tuple, KeysView, ItemsView, Any
+from typing import List, Dict, Tuple, Any
+from functools import lru_cache
+from fractions import Fraction
 import argparse
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import http.server
 import socketserver
+import socket
 from urllib.parse import urlparse, parse_qs
 import json
+import gzip
 import webbrowser
 
-flag_verbose = False
 flag_number_only = False
 
 
-class MultiKeyStaticDict:
-    def __init__(self, initial_dict: Dict[tuple, int]):
-        self._dict: Dict[str, int] = {}
-
-        for keys, value in initial_dict.items():
-            for key in keys:
-                self._dict[key] = value
-
-    def __getitem__(self, key: str) -> int:
-        try:
-            return self._dict[key]
-        except KeyError:
-            raise KeyError(f"Key '{key}' does not exist.")
-
-    def keys(self) -> KeysView[str]:
-        return self._dict.keys()
-
-    def items(self) -> ItemsView[str, int]:
-        return self._dict.items()
+# every name in a key tuple becomes its own key with the same value
+def multi_key_dict(initial_dict: Dict[tuple, int]) -> Dict[str, int]:
+    return {key: value for keys, value in initial_dict.items() for key in keys}
 
 
 BASES_RAW = {
@@ -109,8 +97,10 @@ UNITS_RAW = {
     ("Zib", "zebibit"): 2**70,
     ("Yib", "yobibit"): 2**80,
 }
-BASES = MultiKeyStaticDict(BASES_RAW)
-UNITS = MultiKeyStaticDict(UNITS_RAW)
+BASES = multi_key_dict(BASES_RAW)
+UNITS = multi_key_dict(UNITS_RAW)
+# the first name of every unit is its canonical (short) one
+UNIT_VALUE_TO_NAME = {val: keys[0] for keys, val in UNITS_RAW.items()}
 
 ####################
 # HTML WebUI Stuff #
@@ -120,28 +110,30 @@ WEBUI_HOST = "localhost"
 WEBUI_PORT = 42069
 WEBUI_BACKEND_ENDPOINT = "/backend"
 WEBUI_SHUTDOWN_ENDPOINT = "/shutdown"
-WEBUI_BASE_OPTIONS = "\n".join(
-    [
-        '<option value="{0}"{2}>{1}</option>'.format(
-            val,
-            str(val) + " | " + key[0].capitalize(),
-            " selected" if val == 10 else "",
-        )
+WEBUI_THREADS = 16
+# browsers keep up to about this many connections to one host open, and every kept
+# alive connection holds a pool thread, so a smaller pool leaves requests waiting
+WEBUI_MIN_THREADS = 6
+# short, an idle connection only gives its pool thread back once it times out
+WEBUI_KEEP_ALIVE_TIMEOUT = 2
+
+
+# only build the page when the webui is actually started, the cli never needs it,
+# and keep it encoded so it is not encoded again for every request
+@lru_cache(maxsize=None)
+def get_webui_html() -> bytes:
+    base_options = "\n".join(
+        f'<option value="{val}"{" selected" if val == 10 else ""}>'
+        f"{val} | {key[0].capitalize()}</option>"
         for key, val in BASES_RAW.items()
-    ]
-)
-WEBUI_UNIT_OPTIONS = "\n".join(
-    [
-        '<option value="{0}">{1}</option>'.format(
-            val,
-            key[0] + " | " + key[1].capitalize(),
-        )
+    )
+    unit_options = "\n".join(
+        f'<option value="{val}">{key[0]} | {key[1].capitalize()}</option>'
         for key, val in UNITS_RAW.items()
-    ]
-)
+    )
 
-WEBUI_HTML = (
-    """
+    return (
+        """
 <!DOCTYPE html>
 <html lang="en">
     <head>
@@ -336,16 +328,16 @@ WEBUI_HTML = (
                             >&emsp;From Base
                             <select id="from-base" name="from-base">
 """
-    + WEBUI_BASE_OPTIONS
-    + """
+        + base_options
+        + """
                             </select>
                         </label>
                         <label
                             >&emsp;From Unit
                             <select id="from-unit" name="from-unit">
 """
-    + WEBUI_UNIT_OPTIONS
-    + """
+        + unit_options
+        + """
                             </select>
                         </label>
                     </form>
@@ -363,15 +355,15 @@ WEBUI_HTML = (
                         <label
                             >&emsp;To Base
                             <select id="to-base" name="to-base">"""
-    + WEBUI_BASE_OPTIONS
-    + """
+        + base_options
+        + """
                             </select>
                         </label>
                         <label
                             >&emsp;To Unit
                             <select id="to-unit" name="to-unit">"""
-    + WEBUI_UNIT_OPTIONS
-    + """
+        + unit_options
+        + """
                             </select>
                         </label>
                     </form>
@@ -419,8 +411,8 @@ WEBUI_HTML = (
 
             function shutdownWebUI() {
                 fetch(\""""
-    + WEBUI_SHUTDOWN_ENDPOINT
-    + """\")
+        + WEBUI_SHUTDOWN_ENDPOINT
+        + """\")
                     .finally(() => {
                         window.close();
                         updateError("The WebUI is stopped. You may close this window now.");
@@ -451,8 +443,8 @@ WEBUI_HTML = (
                 }).toString();
 
                 fetch(\""""
-    + WEBUI_BACKEND_ENDPOINT
-    + """?\" + queryParams)
+        + WEBUI_BACKEND_ENDPOINT
+        + """?\" + queryParams)
                     .then(res => res.text())
                     .then(mid => JSON.parse(mid))
                     .then(data => {
@@ -471,82 +463,124 @@ WEBUI_HTML = (
     </body>
 </html>
 """
-)
+    ).encode()
+
+
+# compress the page only once, it never changes while the webui is running
+@lru_cache(maxsize=None)
+def get_webui_html_gzip() -> bytes:
+    return gzip.compress(get_webui_html(), 9)
 
 
 class WebUIHTTPHandler(http.server.SimpleHTTPRequestHandler):
     server_instance = None
+    # keep the connection open between requests, the webui sends one on every keystroke
+    protocol_version = "HTTP/1.1"
+    # but close it soon when idle, as it holds on to a pool thread until then
+    timeout = WEBUI_KEEP_ALIVE_TIMEOUT
 
     @classmethod
     def set_server_instance(cls, server):
         cls.server_instance = server
 
+    def setup(self):
+        super().setup()
+        # send the tiny responses right away instead of waiting to fill up a packet
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_error(self, format, *args):
+        # idle connections timing out is the normal way for them to end, not an error
+        if not format.startswith("Request timed out"):
+            super().log_error(format, *args)
+
     def do_GET(self):
-        # startpage
-        if self.path == "/":
-            self.send_response(200)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            self.wfile.write(WEBUI_HTML.encode())
-        # endpoint for talking to the backend
-        elif self.path.startswith(WEBUI_BACKEND_ENDPOINT):
-            parsed_url = urlparse(self.path)
-            params = parse_qs(parsed_url.query)
+        url = urlparse(self.path)
+        route = self.ROUTES.get(url.path)
+        if route:
+            route(self, url.query)
+        # this page does not exist
+        else:
+            self.send_error(404)
 
-            try:
-                # get arguments from url
-                inputNumber = params["inputNumber"][0]
-                fromBase = base_to_int(params["fromBase"][0], 10)
-                fromUnit = base_to_int(params["fromUnit"][0], 10)
-                toBase = base_to_int(params["toBase"][0], 10)
-                toUnit = base_to_int(params["toUnit"][0], 10)
-
-                # predefine return data
-                return_data = {}
-
-                # argument sanitization
-                try:
-                    # conversation (same as below)
-                    (num, delimiter_offset, is_negative) = type_alphanumeric(
-                        inputNumber
+    # startpage
+    def serve_index(self, query: str):
+        # send the compressed page to every browser that can handle it
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        html = get_webui_html_gzip() if use_gzip else get_webui_html()
+        self.send_response(200)
+        self.send_header("Content-type", "text/html")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(html)))
+        self.end_headers()
+        self.wfile.write(html)
+
+    # endpoint for talking to the backend
+    def serve_backend(self, query: str):
+        params = parse_qs(query)
+
+        try:
+            # get arguments from url
+            inputNumber = params["inputNumber"][0]
+            fromBase = base_to_int(params["fromBase"][0], 10)
+            fromUnit = base_to_int(params["fromUnit"][0], 10)
+            toBase = base_to_int(params["toBase"][0], 10)
+            toUnit = base_to_int(params["toUnit"][0], 10)
+
+            # same base range as the cli enforces in type_base
+            for base in (fromBase, toBase):
+                if not BASE_MIN <= base <= BASE_MAX:
+                    raise ValueError(
+                        f"Base '{base}' is not in range {BASE_MIN} to {BASE_MAX}."
                     )
-                    num = base_to_int(num, fromBase)
-                    if not delimiter_offset == 0:
-                        num = shift_right(num, fromBase, delimiter_offset)
-                    num = num * fromUnit / toUnit
-                    num = float_to_base(num, toBase)
-
-                    # add zero in front of number if it has "decimal' places and is below 1
-                    if num[0] == DELIMITER:
-                        num = "0" + num
-
-                    # add negative sign if input number was negative
-                    if is_negative:
-                        num = "-" + num
-
-                    return_data["result"] = num
-                except Exception as e:
-                    return_data["error"] = str(e)
-
-                # send happy response back to the client
-                self.send_response(200)
-                self.send_header("Content-type", "text/plain")
-                self.end_headers()
-
-                # return the converted output to the webui
-                self.wfile.write(json.dumps(return_data).encode())
-            except (KeyError, ValueError) as e:
-                # send sad response back to the client
-                self.send_error(400, "Invalid parameters", str(e))
-        # endpoint for shutting the server down via the frontend
-        elif self.path.startswith(WEBUI_SHUTDOWN_ENDPOINT):
+
+            # predefine return data
+            return_data = {}
+
+            # argument sanitization
+            try:
+                # conversion (same as in the cli)
+                return_data["result"] = convert(
+                    type_alphanumeric(inputNumber),
+                    fromBase,
+                    fromUnit,
+                    toBase,
+                    toUnit,
+                )
+            except Exception as e:
+                return_data["error"] = str(e)
+
+            # send happy response back to the client
+            response = json.dumps(return_data).encode()
             self.send_response(200)
+            self.send_header("Content-type", "text/plain")
+            self.send_header("Content-Length", str(len(response)))
             self.end_headers()
-            self.wfile.write(b"Shutting down...")
-            threading.Thread(target=self.shutdown_server).start()
-        # this page does not exist
-        else:
-            self.send_error(404)
+
+            # return the converted output to the webui
+            self.wfile.write(response)
+        except (KeyError, ValueError) as e:
+            # send sad response back to the client
+            self.send_error(400, "Invalid parameters", str(e))
+
+    # endpoint for shutting the server down via the frontend
+    def serve_shutdown(self, query: str):
+        response = b"Shutting down..."
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(response)))
+        # nothing is going to come after this one
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(response)
+        threading.Thread(target=self.shutdown_server).start()
+
+    # every page of the webui, looked up by the path without the query
+    ROUTES = {
+        "/": serve_index,
+        WEBUI_BACKEND_ENDPOINT: serve_backend,
+        WEBUI_SHUTDOWN_ENDPOINT: serve_shutdown,
+    }
 
     def shutdown_server(self):
         if self.server_instance:
@@ -558,9 +592,40 @@ def open_browser():
     webbrowser.open_new_tab(f"http://{WEBUI_HOST}:{WEBUI_PORT}")
 
 
-def start_webui():
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", WEBUI_PORT), WebUIHTTPHandler) as httpd:
+# handles requests on a fixed pool of threads, so a slow request does not block
+# the others, without starting a new thread for every single request
+class WebUIServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, threads: int = WEBUI_THREADS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        # kept alive connections that are still open
+        self.connections = set()
+
+    def process_request(self, request, client_address):
+        self.connections.add(request)
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def shutdown_request(self, request):
+        self.connections.discard(request)
+        super().shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        # wake up the threads still waiting on idle kept alive connections, so they
+        # end now instead of keeping the program alive until the connections time out
+        for request in list(self.connections):
+            try:
+                request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        # do not wait for the threads, the pool is not needed anymore
+        self.executor.shutdown(wait=False)
+
+
+def start_webui(threads: int = WEBUI_THREADS):
+    with WebUIServer(("", WEBUI_PORT), WebUIHTTPHandler, threads) as httpd:
         WebUIHTTPHandler.set_server_instance(httpd)
         print(f"Serving WebUI at http://{WEBUI_HOST}:{WEBUI_PORT}")
 
@@ -585,18 +650,18 @@ ALNUM_LIST = "0123456789abcdefghijklmnopqrstuvwxyz"
 DELIMITER = "."
 BASE_MIN = 2
 BASE_MAX = 36
+# int() accepts at least this many digits in any base, whatever its limit is set to
+INT_CHUNK_DIGITS = 640
+# format() specs for the bases python knows how to write itself
+INT_FORMATS = {2: "b", 8: "o", 10: "d", 16: "x"}
 
 
 def get_abs_and_sign(val: str) -> Tuple[str, bool]:
-    negative_count = 0
-
-    while val[0] in "-+":
-        if val[0] == "-":
-            negative_count += 1
-        val = val[1:]
-    is_negative = negative_count % 2 == 1
+    # length of the leading run of signs, every minus in there flips the sign
+    prefix_len = len(val) - len(val.lstrip("-+"))
+    is_negative = val[:prefix_len].count("-") % 2 == 1
 
-    return (val, is_negative)
+    return (val[prefix_len:], is_negative)
 
 
 def type_alphanumeric(val: str) -> Tuple[str, int, bool]:
@@ -611,42 +676,52 @@ def type_alphanumeric(val: str) -> Tuple[str, int, bool]:
         val_form = val_form.replace(DELIMITER, "")
         delimiter_offset = len(val_form) - delimiter_pos
 
-    if all(c in ALNUM_LIST for c in val_form):
-        return (val_form, delimiter_offset, is_negative)
+    # signs and a delimiter alone are no number
+    if not val_form:
+        raise argparse.ArgumentTypeError(f"Number '{val}' has no digits.")
 
-    raise argparse.ArgumentTypeError(
-        f"Number '{val}' may exist, but this program does not support it."
-    )
+    # the digits are only checked once the base is known, in base_to_int
+    return (val_form, delimiter_offset, is_negative)
 
 
+@lru_cache(maxsize=None)
 def type_base(val: str) -> int:
-    bases_list = list(BASES.keys())
+    number_base = BASES.get(val.lower())
+    if number_base is not None:
+        return number_base
 
-    if val.lower() in bases_list:
-        return BASES[val.lower()]
-    else:
-        number_base = base_to_int(val, BASES["decimal"])
-        if BASE_MIN <= number_base <= BASE_MAX:
-            return number_base
+    number_base = base_to_int(val, BASES["decimal"])
+    if BASE_MIN <= number_base <= BASE_MAX:
+        return number_base
 
     raise argparse.ArgumentTypeError(
         f"Base '{val}' may exist, but this program does not support it."
     )
 
 
+@lru_cache(maxsize=None)
 def type_unit(val: str) -> int:
-    units_list = list(UNITS.keys())
-
-    if val in units_list:
-        return UNITS[val]
-    elif val.lower() in units_list:
-        return UNITS[val.lower()]
+    # exact spelling first ("Mb" is not "MB"), then lowercase for names like "Byte"
+    unit = UNITS.get(val) or UNITS.get(val.lower())
+    if unit is not None:
+        return unit
 
     raise argparse.ArgumentTypeError(
         f"Unit '{val}' may exist, but this program does not support it."
     )
 
 
+def type_threads(val: str) -> int:
+    threads = base_to_int(val, BASES["decimal"])
+    if threads >= WEBUI_MIN_THREADS:
+        return threads
+
+    raise argparse.ArgumentTypeError(
+        f"The WebUI needs at least {WEBUI_MIN_THREADS} threads (one for every "
+        f"connection a browser keeps open), not '{val}'."
+    )
+
+
 ###################
 # Parse Arguments #
 ###################
@@ -717,6 +792,12 @@ def get_arguments() -> Any:
         help="Only output the final number as a result",
         action="store_true",
     )
+    parser.add_argument(
+        "--threads-http",
+        help=f"Threads the WebUI serves requests with (default {WEBUI_THREADS})",
+        type=type_threads,
+        default=WEBUI_THREADS,
+    )
 
     return parser.parse_args()
 
@@ -726,56 +807,155 @@ def get_arguments() -> Any:
 #####################
 
 
-def float_to_int(num: float) -> int:
-    if num < 0:
-        return -(float_to_int(-num))
-
-    num_str = str(num)
-    num_whole = num_str.split(DELIMITER)[0]
-
-    res = 0
-    for digit in num_whole:
-        digit_num = ALNUM_LIST.index(digit)
-        res = res * 10 + digit_num
-    return res
+# the same few powers of a base get requested over and over, so only compute them once
+@lru_cache(maxsize=256)
+def base_power(base: int, exponent: int) -> int:
+    return base**exponent
 
 
 def base_to_int(num: str, base: int) -> int:
-    res = 0
-    for digit in num:
-        n = ALNUM_LIST.index(digit)
-        if n + 1 > base:
-            raise ValueError(f"Number '{num}' is not of base '{base}'.")
-        res = n + base * res
-    return res
+    # strip all valid digits of the base, whatever is left is not part of it
+    # (also keeps int() from accepting things like "0x", "_" or whitespace)
+    if num.strip(ALNUM_LIST[:base]):
+        raise ValueError(f"Number '{num}' is not of base '{base}'.")
+
+    # int() does the exact same horner evaluation, just in c
+    try:
+        return int(num, base)
+    except ValueError:
+        # int() refuses very long numbers in non power of two bases
+        pass
+
+    return long_base_to_int(num, base)
+
+
+# converts numbers too long for int() by splitting them into a high and a low part
+# and combining them as high * base**len(low) + low. unlike adding one chunk at a time,
+# this multiplies numbers of about the same size, which python does much faster
+def long_base_to_int(num: str, base: int) -> int:
+    if len(num) <= INT_CHUNK_DIGITS:
+        return int(num, base)
+
+    # the low part is a power of two number of chunks, so the same few powers of the
+    # base are needed for all numbers
+    low_len = INT_CHUNK_DIGITS
+    while low_len * 2 < len(num):
+        low_len *= 2
+
+    high = long_base_to_int(num[:-low_len], base)
+    low = long_base_to_int(num[-low_len:], base)
+    return high * base_power(base, low_len) + low
+
+
+def int_to_base(num: int, base: int) -> str:
+    # python can format the most common bases by itself (in c)
+    if base in INT_FORMATS:
+        try:
+            return format(num, INT_FORMATS[base])
+        except ValueError:
+            # unless it is a decimal number too long for the int to str conversion limit
+            pass
+
+    # the other power of two bases are groups of bits of the binary representation,
+    # which saves dividing the whole number once for every digit
+    if base & (base - 1) == 0:
+        bits_per_digit = base.bit_length() - 1
+        bits = format(num, "b")
+        # pad the front with zeros up to a whole number of digits
+        bits = bits.zfill(-(-len(bits) // bits_per_digit) * bits_per_digit)
+        return "".join(
+            ALNUM_LIST[int(bits[i : i + bits_per_digit], 2)]
+            for i in range(0, len(bits), bits_per_digit)
+        )
 
+    if num == 0:
+        return "0"
+
+    # very long numbers get split into a high and a low part of digits which are
+    # converted on their own, as dividing by one big power of the base is a lot faster
+    # than dividing the whole number again for every chunk of digits
+    if num >= base_power(base, INT_CHUNK_DIGITS):
+        low_len = INT_CHUNK_DIGITS
+        while num >= base_power(base, low_len * 2):
+            low_len *= 2
+        high, low = divmod(num, base_power(base, low_len))
+        # the low part needs its leading zeros, they are digits in the middle now
+        return int_to_base(high, base) + int_to_base(low, base).zfill(low_len)
+
+    # collect the digits from lowest to highest and join them once at the end,
+    # dividing off as many digits at once as fit into a single 30 bit int digit,
+    # so only one division per chunk has to go over the whole big number
+    chunk_len = 30 // base.bit_length()
+    chunk_base = base_power(base, chunk_len)
+    digits = []
+    while num >= chunk_base:
+        num, chunk = divmod(num, chunk_base)
+        for _ in range(chunk_len):
+            chunk, digit = divmod(chunk, base)
+            digits.append(ALNUM_LIST[digit])
+    while num > 0:
+        num, digit = divmod(num, base)
+        digits.append(ALNUM_LIST[digit])
+    return "".join(reversed(digits))
+
+
+def fraction_to_base(num: Fraction, base: int, precision: int = 8) -> str:
+    # split off the whole part, the decimals stay an exact remainder of the denominator
+    # (plain ints work too, they have a numerator and a denominator of 1 as well)
+    denominator = num.denominator
+    num_whole, remainder = divmod(num.numerator, denominator)
+    res = int_to_base(num_whole, base)
+
+    # only calculate up to the given precision, most fractions never end in other bases.
+    # the first digits of remainder / denominator in the base are the same as the whole
+    # part of remainder * base**precision / denominator, so get them all in one division
+    decimals = remainder * base_power(base, precision) // denominator
+    # digits too small to show up in the precision are no decimals at all
+    res_decimals = int_to_base(decimals, base).zfill(precision).rstrip("0")
 
-def float_to_base(num: float, base: int) -> str:
-    res = ""
-    num_whole = float_to_int(num)
-    num_decimals = num - num_whole
+    return (res + DELIMITER + res_decimals) if res_decimals else res
 
-    while num_whole > 0:
-        res = ALNUM_LIST[float_to_int(num_whole % base)] + res
-        num_whole //= base
 
-    res_decimals = ""
-    # only calculate a precision of 8 digits or else the devil himself show up and throw all kinds of weird errors
-    for _ in range(8):
-        # silence this unprecise floating point to death so no weird fucks will be appended
-        if abs(num_decimals) < 1e-8:
-            break
+# the whole conversion from a parsed input number to the output string,
+# used by both the cli and the webui (which asks for the same conversions over and
+# over while typing and deleting, so remember the latest ones)
+@lru_cache(maxsize=256)
+def convert(
+    number: Tuple[str, int, bool],
+    from_base: int,
+    from_unit: int,
+    to_base: int,
+    to_unit: int,
+) -> str:
+    (num, delimiter_offset, is_negative) = number
+
+    if (
+        from_base == to_base == 10
+        and delimiter_offset == 0
+        and from_unit % to_unit == 0
+    ):
+        # whole decimal numbers with a whole unit ratio stay in exact integer math
+        num = base_to_int(num, 10) * (from_unit // to_unit)
+        res = int_to_base(num, 10)
+        verbose("decimal fast path:", res)
+    else:
+        num = base_to_int(num, from_base)
+        verbose("base_to_int:", num)
 
-        num_decimals *= base
-        digit = float_to_int(num_decimals)
-        res_decimals += ALNUM_LIST[digit]
-        num_decimals -= digit
+        # shift the delimiter back in and scale to the target unit in one exact fraction
+        num = Fraction(
+            num * from_unit, base_power(from_base, delimiter_offset) * to_unit
+        )
+        verbose("shift and unit calculation:", num)
 
-    return (res + DELIMITER + res_decimals) if res_decimals else res
+        res = fraction_to_base(num, to_base)
+        verbose("fraction_to_base:", res)
 
+    # add negative sign if input number was negative (zero has no sign)
+    if is_negative and res != "0":
+        res = "-" + res
 
-def shift_right(num: int, base: int, offset: int) -> float:
-    return num / base**offset
+    return res
 
 
 ########
@@ -783,41 +963,31 @@ def shift_right(num: int, base: int, offset: int) -> float:
 ########
 
 
-# fill spaces to the left up to n minus length of str
-def fill_spaces(text: str, n: int) -> str:
-    return (" " * (n - len(text))) + text
-
-
 # output a two dimensional list as a fancy ascii art table
 def output_as_table(two_dim_list: List[List[str]]):
-    col_lenghts = [0] * max([len(inner_list) for inner_list in two_dim_list])
-
-    for row in range(len(two_dim_list)):
-        for col in range(len(two_dim_list[row])):
-            col_len = len(str(two_dim_list[row][col]))
-            if col_lenghts[col] < col_len:
-                col_lenghts[col] = col_len
+    # turn every cell into a string once instead of every time it is measured or printed
+    rows = [[str(cell) for cell in row] for row in two_dim_list]
+    col_lengths = [
+        max(len(row[col]) for row in rows if col < len(row))
+        for col in range(max(map(len, rows)))
+    ]
 
     row_separator = (
-        "+" + "+".join(["-" * (col_len + 2) for col_len in col_lenghts]) + "+"
+        "+" + "+".join(["-" * (col_len + 2) for col_len in col_lengths]) + "+"
     )
-    for row in range(len(two_dim_list)):
-        print(row_separator)
-        print("|", end="")
-        for col in range(len(two_dim_list[row])):
-            print(
-                " " + fill_spaces(str(two_dim_list[row][col]), col_lenghts[col]) + " |",
-                end="",
-            )
-        print()
-    print(row_separator)
+    # build the whole table first and print it in one go instead of cell by cell
+    lines = [row_separator]
+    for row in rows:
+        cells = " | ".join(
+            cell.rjust(col_len) for cell, col_len in zip(row, col_lengths)
+        )
+        lines.append("| " + cells + " |")
+        lines.append(row_separator)
+    print("\n".join(lines))
 
 
 def num_to_unit(num: int) -> str:
-    for key, val in UNITS.items():
-        if val == num:
-            return key
-    return ""
+    return UNIT_VALUE_TO_NAME.get(num, "")
 
 
 ###########
@@ -826,19 +996,18 @@ def num_to_unit(num: int) -> str:
 
 
 def init_flags(args):
-    global flag_verbose, flag_number_only
+    global flag_number_only, verbose
 
-    flag_verbose = args.verbose
     flag_number_only = args.number_only
+    # instead of checking the flag on every call, verbose output simply becomes print
+    if args.verbose:
+        verbose = print
 
 
 # call this if you want to print something to the screen if the user chose verbose output
-# good for debugging
+# good for debugging (does nothing unless init_flags swapped it for print)
 def verbose(*o):
-    global flag_verbose
-
-    if flag_verbose:
-        print(*o)
+    pass
 
 
 def main() -> int:
@@ -849,33 +1018,21 @@ def main() -> int:
 
     # if webui flag is set, start it
     if args.web_ui:
-        start_webui()
+        start_webui(args.threads_http)
         # return after exiting webui
         return 0
 
     (num, delimiter_offset, is_negative) = args.number
     verbose("num, del, neg:", num, delimiter_offset, is_negative)
 
-    num = base_to_int(num, args.from_base)
-    verbose("base_to_int:", num)
-
-    if not delimiter_offset == 0:
-        num = shift_right(num, args.from_base, delimiter_offset)
-        verbose("shift_right:", num)
-
-    num = num * args.from_unit / args.to_unit
-    verbose("unit calculation:", num)
-
-    num = float_to_base(num, args.to_base)
-    verbose("float_to_base:", num)
-
-    # add zero in front of number if it has "decimal' places and is below 1
-    if num[0] == DELIMITER:
-        num = "0" + num
-
-    # add negative sign if input number was negative
-    if is_negative:
-        num = "-" + num
+    try:
+        num = convert(
+            args.number, args.from_base, args.from_unit, args.to_base, args.to_unit
+        )
+    except ValueError as e:
+        # the number has digits that do not belong to its base
+        print(f"error: {e}", file=sys.stderr)
+        return 1
 
     # only print number as output if flag is set, else make a fancy table output
     if flag_number_only: